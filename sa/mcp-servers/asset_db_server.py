@@ -1,67 +1,125 @@
+import os
 import sys
 import json
 import logging
 import argparse
-import asyncio
+import threading
+import time
 from datetime import datetime
-from typing import Dict
-from pydantic import BaseModel
-from fastmcp import FastMCP
-from llama_stack_client import LlamaStackClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Registration retries with exponential backoff (seconds) before giving up
+REGISTER_ATTEMPTS = 8
+REGISTER_INITIAL_DELAY = 1.0
+REGISTER_MAX_DELAY = 30.0
+
 # Global counter for alternating purchase dates
 purchase_date_counter = 0
 
 
-class LaptopInfo(BaseModel):
-    """Model for laptop information response"""
+def create_server():
+    """
+    Create the FastMCP server and its tools.
 
-    employee_id: str
-    geo: str
-    purchase_date: str
-    timestamp: str
+    fastmcp and pydantic are imported here rather than at module load so
+    that argument parsing (and --help) does not pay for them.
+    """
+    from pydantic import BaseModel
+    from fastmcp import FastMCP
+
+    class LaptopInfo(BaseModel):
+        """Model for laptop information response"""
+
+        employee_id: str
+        geo: str
+        purchase_date: str
+        timestamp: str
+
+    # Create the FastMCP server
+    server = FastMCP("Asset Database Server")
+
+    @server.tool()
+    async def get_laptop_info(employee_id: str) -> str:
+        """
+        Get laptop information for an employee including geo location and purchase date.
+
+        Args:
+            employee_id: The ID of the employee to look up laptop information for
+
+        Returns:
+            JSON string containing laptop information including geo, purchase date and timestamp
+        """
+        global purchase_date_counter
+
+        # Alternate between two purchase dates as specified
+        if purchase_date_counter % 2 == 0:
+            purchase_date = "5 years 1 month"
+        else:
+            purchase_date = "2 years 3 months"
+        purchase_date_counter += 1
+
+        # Always return "North America" as geo as specified
+        geo = "North America"
+
+        laptop_info = LaptopInfo(
+            employee_id=employee_id,
+            geo=geo,
+            purchase_date=purchase_date,
+            timestamp=datetime.now().isoformat(),
+        )
 
+        logger.info(
+            f"Retrieved laptop info for employee {employee_id}: {laptop_info}"
+        )
+        return json.dumps(laptop_info.dict())
 
-# Create the FastMCP server
-server = FastMCP("Asset Database Server")
+    return server
 
 
-@server.tool()
-async def get_laptop_info(employee_id: str) -> str:
+def register_toolgroup(llama_stack_host, host, port):
     """
-    Get laptop information for an employee including geo location and purchase date.
-
-    Args:
-        employee_id: The ID of the employee to look up laptop information for
+    Register the MCP toolgroup with LLama Stack, retrying with backoff.
 
-    Returns:
-        JSON string containing laptop information including geo, purchase date and timestamp
+    Runs in a background thread so that it does not delay serving. If
+    registration still fails after REGISTER_ATTEMPTS tries the process exits
+    so that it gets restarted, as it did when registration happened first.
     """
-    global purchase_date_counter
-
-    # Alternate between two purchase dates as specified
-    if purchase_date_counter % 2 == 0:
-        purchase_date = "5 years 1 month"
-    else:
-        purchase_date = "2 years 3 months"
-    purchase_date_counter += 1
-
-    # Always return "North America" as geo as specified
-    geo = "North America"
-
-    laptop_info = LaptopInfo(
-        employee_id=employee_id,
-        geo=geo,
-        purchase_date=purchase_date,
-        timestamp=datetime.now().isoformat(),
-    )
-
-    logger.info(f"Retrieved laptop info for employee {employee_id}: {laptop_info}")
-    return json.dumps(laptop_info.dict())
+    try:
+        # Only needed when registering, so keep it off the --no-register path
+        from llama_stack_client import LlamaStackClient
+    except ImportError as e:
+        logger.error(f"Unable to register MCP server with LLama Stack: {e}")
+        os._exit(1)
+
+    # --llama-stack-host is host:port, fall back to the default port if omitted
+    base_url = f"http://{llama_stack_host}"
+    if ":" not in llama_stack_host:
+        base_url += ":8321"
+
+    client = LlamaStackClient(base_url=base_url, timeout=120.0)
+    delay = REGISTER_INITIAL_DELAY
+    for attempt in range(1, REGISTER_ATTEMPTS + 1):
+        try:
+            client.toolgroups.register(
+                toolgroup_id="mcp::asset_db_server",
+                provider_id="model-context-protocol",
+                mcp_endpoint={"uri": f"http://{host}:{port}/sse"},
+            )
+            logger.info(f"Registered MCP server at http://{host}:{port}/sse")
+            return
+        except Exception as e:
+            logger.warning(
+                f"Registration attempt {attempt}/{REGISTER_ATTEMPTS} failed: {e}"
+            )
+            if attempt < REGISTER_ATTEMPTS:
+                time.sleep(delay)
+                delay = min(delay * 2, REGISTER_MAX_DELAY)
+
+    logger.error("Failed to register MCP server with LLama Stack, exiting")
+    os._exit(1)
 
 
 def main():
@@ -103,18 +161,16 @@ def main():
     logger.info(f"MCP Server port: {args.port}")
     logger.info(f"LLama Stack host: {args.llama_stack_host}")
 
+    # Build the server only once we know it is going to be run
+    server = create_server()
+
     if not args.no_register:
-        # Register the MCP toolgroup
-        client = LlamaStackClient(
-            base_url=f"http://{args.llama_stack_host}:8321",
-            timeout=120.0,
-        )
-        client.toolgroups.register(
-            toolgroup_id="mcp::asset_db_server",
-            provider_id="model-context-protocol",
-            mcp_endpoint={"uri": f"http://{args.host}:{args.port}/sse"},
-        )
-        logger.info(f"Registered MCP server at http://{args.host}:{args.port}/sse")
+        # Register in the background so that it does not delay serving
+        threading.Thread(
+            target=register_toolgroup,
+            args=(args.llama_stack_host, args.host, args.port),
+            daemon=True,
+        ).start()
 
     # Run the FastMCP server with SSE transport
     logger.info("Starting FastMCP server with SSE transport...")
@@ -1,62 +1,120 @@
+import os
 import sys
 import json
 import logging
 import argparse
-import asyncio
 import random
+import threading
+import time
 from datetime import datetime
-from typing import Dict
-from pydantic import BaseModel
-from fastmcp import FastMCP
-from llama_stack_client import LlamaStackClient
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Registration retries with exponential backoff (seconds) before giving up
+REGISTER_ATTEMPTS = 8
+REGISTER_INITIAL_DELAY = 1.0
+REGISTER_MAX_DELAY = 30.0
 
-class LaptopRequestResponse(BaseModel):
-    """Model for laptop request response"""
-
-    employee_id: str
-    laptop_model: str
-    ticket_number: str
-    status: str
-    timestamp: str
 
+def create_server():
+    """
+    Create the FastMCP server and its tools.
 
-# Create the FastMCP server
-server = FastMCP("ServiceNow Server")
+    fastmcp and pydantic are imported here rather than at module load so
+    that argument parsing (and --help) does not pay for them.
+    """
+    from pydantic import BaseModel
+    from fastmcp import FastMCP
+
+    class LaptopRequestResponse(BaseModel):
+        """Model for laptop request response"""
+
+        employee_id: str
+        laptop_model: str
+        ticket_number: str
+        status: str
+        timestamp: str
+
+    # Create the FastMCP server
+    server = FastMCP("ServiceNow Server")
+
+    @server.tool()
+    async def submit_laptop_request(employee_id: str, laptop_model: str) -> str:
+        """
+        Submit a laptop request to ServiceNow and get a ticket number.
+
+        Args:
+            employee_id: The ID of the employee requesting the laptop
+            laptop_model: The model of laptop being requested
+
+        Returns:
+            JSON string containing ticket information including ticket number, status and timestamp
+        """
+        # Generate a random ticket number (ServiceNow style)
+        ticket_number = f"REQ{random.randint(1000000, 9999999)}"
+
+        # Set status to "Submitted" for new requests
+        status = "Submitted"
+
+        laptop_request = LaptopRequestResponse(
+            employee_id=employee_id,
+            laptop_model=laptop_model,
+            ticket_number=ticket_number,
+            status=status,
+            timestamp=datetime.now().isoformat(),
+        )
 
+        logger.info(
+            f"Created laptop request for employee {employee_id}: {laptop_request}"
+        )
+        return json.dumps(laptop_request.dict())
 
-@server.tool()
-async def submit_laptop_request(employee_id: str, laptop_model: str) -> str:
-    """
-    Submit a laptop request to ServiceNow and get a ticket number.
+    return server
 
-    Args:
-        employee_id: The ID of the employee requesting the laptop
-        laptop_model: The model of laptop being requested
 
-    Returns:
-        JSON string containing ticket information including ticket number, status and timestamp
+def register_toolgroup(llama_stack_host, host, port):
     """
-    # Generate a random ticket number (ServiceNow style)
-    ticket_number = f"REQ{random.randint(1000000, 9999999)}"
-
-    # Set status to "Submitted" for new requests
-    status = "Submitted"
-
-    laptop_request = LaptopRequestResponse(
-        employee_id=employee_id,
-        laptop_model=laptop_model,
-        ticket_number=ticket_number,
-        status=status,
-        timestamp=datetime.now().isoformat(),
-    )
+    Register the MCP toolgroup with LLama Stack, retrying with backoff.
 
-    logger.info(f"Created laptop request for employee {employee_id}: {laptop_request}")
-    return json.dumps(laptop_request.dict())
+    Runs in a background thread so that it does not delay serving. If
+    registration still fails after REGISTER_ATTEMPTS tries the process exits
+    so that it gets restarted, as it did when registration happened first.
+    """
+    try:
+        # Only needed when registering, so keep it off the --no-register path
+        from llama_stack_client import LlamaStackClient
+    except ImportError as e:
+        logger.error(f"Unable to register MCP server with LLama Stack: {e}")
+        os._exit(1)
+
+    # --llama-stack-host is host:port, fall back to the default port if omitted
+    base_url = f"http://{llama_stack_host}"
+    if ":" not in llama_stack_host:
+        base_url += ":8321"
+
+    client = LlamaStackClient(base_url=base_url, timeout=120.0)
+    delay = REGISTER_INITIAL_DELAY
+    for attempt in range(1, REGISTER_ATTEMPTS + 1):
+        try:
+            client.toolgroups.register(
+                toolgroup_id="mcp::servicenow",
+                provider_id="model-context-protocol",
+                mcp_endpoint={"uri": f"http://{host}:{port}/sse"},
+            )
+            logger.info(f"Registered MCP server at http://{host}:{port}/sse")
+            return
+        except Exception as e:
+            logger.warning(
+                f"Registration attempt {attempt}/{REGISTER_ATTEMPTS} failed: {e}"
+            )
+            if attempt < REGISTER_ATTEMPTS:
+                time.sleep(delay)
+                delay = min(delay * 2, REGISTER_MAX_DELAY)
+
+    logger.error("Failed to register MCP server with LLama Stack, exiting")
+    os._exit(1)
 
 
 def main():
@@ -98,18 +156,16 @@ def main():
     logger.info(f"MCP Server port: {args.port}")
     logger.info(f"LLama Stack host: {args.llama_stack_host}")
 
+    # Build the server only once we know it is going to be run
+    server = create_server()
+
     if not args.no_register:
-        # Register the MCP toolgroup
-        client = LlamaStackClient(
-            base_url=f"http://{args.llama_stack_host}:8321",
-            timeout=120.0,
-        )
-        client.toolgroups.register(
-            toolgroup_id="mcp::servicenow",
-            provider_id="model-context-protocol",
-            mcp_endpoint={"uri": f"http://{args.host}:{args.port}/sse"},
-        )
-        logger.info(f"Registered MCP server at http://{args.host}:{args.port}/sse")
+        # Register in the background so that it does not delay serving
+        threading.Thread(
+            target=register_toolgroup,
+            args=(args.llama_stack_host, args.host, args.port),
+            daemon=True,
+        ).start()
 
     # Run the FastMCP server with SSE transport
     logger.info("Starting FastMCP server with SSE transport...")
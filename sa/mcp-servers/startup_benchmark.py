@@ -0,0 +1,242 @@
+import sys
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import statistics
+import tempfile
+import subprocess
+from pathlib import Path
+
+import httpx
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# Don't log every request made while polling the servers
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+SERVERS_DIR = Path(__file__).resolve().parent
+
+# Server script and a tool call that should succeed against it
+SERVERS = {
+    "asset_db": (
+        "asset_db_server.py",
+        "get_laptop_info",
+        {"employee_id": "1234"},
+    ),
+    "servicenow": (
+        "servicenow_server.py",
+        "submit_laptop_request",
+        {"employee_id": "1234", "laptop_model": "MacBook Pro"},
+    ),
+}
+
+
+class StartupError(Exception):
+    """Raised when a server does not answer its first tool call"""
+
+
+def positive_int(value):
+    """argparse type for integers of at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def free_port(host):
+    """Ask the OS for a port that is currently free"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def unresponsive_listener(host):
+    """
+    Listen on a free port but never accept, so requests to it just hang.
+
+    Used as the LLama Stack host when benchmarking the registering mode,
+    so that startup only stays fast if registration is off the serving path.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind((host, 0))
+    sock.listen()
+    return sock
+
+
+def is_connection_error(error):
+    """Whether the tool call failed because the server is not up yet"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    # fastmcp wraps connection failures in a RuntimeError
+    return isinstance(error, RuntimeError) and isinstance(
+        error.__cause__, httpx.TransportError
+    )
+
+
+async def first_tool_call(process, url, tool, arguments):
+    """Retry the tool call until it succeeds or the server exits"""
+    while True:
+        if process.poll() is not None:
+            raise StartupError(f"server exited with code {process.returncode}")
+        try:
+            async with Client(url) as client:
+                await client.call_tool(tool, arguments)
+            return
+        except ToolError as e:
+            raise StartupError(f"tool call failed: {e}") from e
+        except Exception as e:
+            if not is_connection_error(e):
+                raise
+            await asyncio.sleep(0.02)
+
+
+def stop(process):
+    """Terminate a server process, killing it if it does not exit"""
+    if process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def measure_startup(name, host, timeout, llama_stack_host=None):
+    """
+    Start a server and time it from process start to first successful tool call.
+
+    Args:
+        name: The server to start, a key of SERVERS
+        host: Host IP to run the server on
+        timeout: Seconds to wait for the first successful tool call
+        llama_stack_host: If set, run in the default registering mode against
+            this LLama Stack host:port instead of with --no-register
+
+    Returns:
+        Elapsed time in seconds
+    """
+    script, tool, arguments = SERVERS[name]
+    port = free_port(host)
+    url = f"http://{host}:{port}/sse"
+
+    command = [sys.executable, str(SERVERS_DIR / script)]
+    if llama_stack_host is None:
+        command.append("--no-register")
+    else:
+        command += ["--llama-stack-host", llama_stack_host]
+    command += ["--host", host, "--port", str(port), "--log-level", "WARNING"]
+
+    # Keep stderr in a file rather than a pipe so a chatty server can't block
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr)
+        try:
+            asyncio.run(
+                asyncio.wait_for(
+                    first_tool_call(process, url, tool, arguments), timeout
+                )
+            )
+            return time.perf_counter() - start
+        except asyncio.TimeoutError:
+            error = StartupError(f"no successful tool call within {timeout}s")
+        except StartupError as e:
+            error = e
+        finally:
+            stop(process)
+
+        # Show why the server failed, not just that it did
+        stderr.seek(0)
+        output = stderr.read().decode(errors="replace").strip()
+        raise StartupError(f"{error}\n{output}" if output else str(error))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Measure MCP server startup time (process start to first tool call)"
+    )
+    parser.add_argument(
+        "--server",
+        choices=list(SERVERS) + ["all"],
+        default="all",
+        help="Server to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="Host IP to run the MCP servers on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--iterations",
+        default=5,
+        type=positive_int,
+        help="Number of startups to measure per server (default: 5)",
+    )
+    parser.add_argument(
+        "--timeout",
+        default=60.0,
+        type=float,
+        help="Seconds to wait for a server to answer a tool call (default: 60)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="Fail if the median startup time of any server exceeds this",
+    )
+    parser.add_argument(
+        "--register",
+        action="store_true",
+        help="Start the servers in their default registering mode against an "
+        "unresponsive LLama Stack host instead of with --no-register",
+    )
+
+    args = parser.parse_args()
+
+    listener = unresponsive_listener(args.host) if args.register else None
+    llama_stack_host = (
+        f"{args.host}:{listener.getsockname()[1]}" if listener else None
+    )
+
+    names = list(SERVERS) if args.server == "all" else [args.server]
+    exit_code = 0
+    try:
+        for name in names:
+            try:
+                timings = [
+                    measure_startup(name, args.host, args.timeout, llama_stack_host)
+                    for _ in range(args.iterations)
+                ]
+            except StartupError as e:
+                logger.error(f"{name} failed to start: {e}")
+                exit_code = 1
+                continue
+
+            median = statistics.median(timings)
+            print(
+                f"{name}: median {median:.3f}s "
+                f"min {min(timings):.3f}s max {max(timings):.3f}s "
+                f"({args.iterations} runs)"
+            )
+            if args.max_seconds is not None and median > args.max_seconds:
+                logger.error(
+                    f"{name} startup median {median:.3f}s "
+                    f"exceeds {args.max_seconds:.3f}s"
+                )
+                exit_code = 1
+    finally:
+        if listener:
+            listener.close()
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    if exit_code:
+        sys.exit(exit_code)